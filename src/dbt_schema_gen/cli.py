@@ -4,25 +4,98 @@ dbt-schema-gen CLI
 
 * Runs from project root **or** any folder beneath `models/`.
 * Skips LLM + file-touch when columns unchanged (unless -o / --overwrite).
+* Models whose SQL, sources and prompt are unchanged since an earlier run
+  reuse the entry stored in `.dbt-schema-gen-cache/` (next to `models/`).
+* LLM calls for independent models run concurrently (asyncio, bounded).
 * Flags:
     -m / --models     comma-sep names to process
-    -o / --overwrite  always regenerate
+    -o / --overwrite  regenerate even if columns are unchanged (bypasses the
+                      model cache; add --no-cache for a fresh LLM reply)
     --skip-tests      strip every tests: block
+    -j / --jobs       max concurrent LLM calls
+    --no-cache        ignore the LLM response and model caches
+    --batch           use the provider's batch API instead of live calls
+                      (Anthropic only; other providers fall back to live calls)
 """
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import io
 import sys
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
 import click
-import yaml
 
 from .config import get_provider_class
-from .extractor import extract_columns_from_sql, get_metadata_from_path
-from .renderer import build_prompt
+from .extractor import parse_columns, get_metadata_from_path
+from .renderer import _PREAMBLE_VERSION, build_prompt
 from .utils import pathing, yaml_tools, tests
+from .utils.rate_limiter import AIMD
+from .utils.response_cache import RESPONSE_CACHE, ResponseCache
+from .llm.base import LLMProvider
+
+@functools.lru_cache(maxsize=None)
+def _load_existing(schema_path: Path, mtime_ns: int) -> Dict[str, frozenset]:
+    """
+    ``{model_name: column_names}`` for an existing schema.yml.
+
+    Keyed on mtime so sibling models in one folder share a single parse,
+    while a rewritten file is picked up again.
+    """
+    doc = yaml_tools.load_yaml(schema_path.read_text()) or {}
+    return {
+        m["name"]: frozenset(c["name"] for c in m.get("columns") or [])
+        for m in doc.get("models", [])
+    }
+
+
+# ───────────────────────── worker ─────────────────────────────────────
+def _sources_for(sql: Path, models_root: Path) -> Tuple[str, str]:
+    """``(sector, sources_yaml)`` for one model; YAML is empty if none is found."""
+    sector = get_metadata_from_path(sql)["sector"] or "unknown"
+    src = models_root / sector / f"{sector}_sources.yml"
+    if not src.exists():
+        alts = list(sql.parent.glob("*_sources.yml"))
+        src = alts[0] if alts else None
+    return sector, src.read_text() if src else ""
+
+
+def _sql_cache_key(
+    sql: Path, sql_text: str, sources: str, llm: LLMProvider, *, skip_tests: bool
+) -> str:
+    """
+    Key for the project-local model cache: the SQL itself plus everything
+    else that shapes the reply, so template or provider changes miss cleanly.
+    """
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+    h = hashlib.blake2b(sql_text.encode(), digest_size=16)
+    for part in (sources, sql.stem, type(llm).__name__, model, _PREAMBLE_VERSION, str(skip_tests)):
+        h.update(b"\0" + part.encode())
+    return h.hexdigest()
+
+
+def _dump_models(models: List[Dict[str, Any]]) -> str:
+    buf = io.StringIO()
+    yaml_tools.dump_yaml({"version": 2, "models": models}, buf)
+    return buf.getvalue()
+
+
+def _canonise_reply(
+    sql: Path, raw_reply: str, *, skip_tests: bool
+) -> Optional[List[Dict[str, Any]]]:
+    """Parse + normalise one LLM reply into model blocks; None if unusable."""
+    try:
+        parsed = yaml_tools.normalize_schema(yaml_tools.parse_llm_yaml(raw_reply))
+        blocks = parsed["models"] if isinstance(parsed, dict) and "models" in parsed else [parsed]
+        if not blocks or not all(isinstance(b, dict) for b in blocks):
+            raise ValueError("reply is not a schema mapping")
+        return [tests.canonise_model(b, sql.stem, strip_tests=skip_tests) for b in blocks]
+    except Exception as exc:
+        click.echo(f"⚠️  skipping {sql.name}: {exc}", err=True)
+        return None
 
 
 # ───────────────────────── CLI ────────────────────────────────────────
@@ -38,7 +111,10 @@ from .utils import pathing, yaml_tools, tests
     "--overwrite",
     is_flag=True,
     default=False,
-    help="Force overwrite even if existing columns are unchanged.",
+    help=(
+        "Force overwrite even if existing columns are unchanged; skips the model "
+        "cache. Replies may still come from the LLM response cache (see --no-cache)."
+    ),
 )
 @click.option(
     "--skip-tests",
@@ -46,12 +122,47 @@ from .utils import pathing, yaml_tools, tests
     default=False,
     help="Remove all tests blocks from generated YAML.",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=8,
+    envvar="LLM_MAX_CONCURRENCY",
+    show_default=True,
+    help="Maximum number of concurrent LLM calls (env: LLM_MAX_CONCURRENCY).",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Always call the LLM, ignoring cached replies and model entries.",
+)
+@click.option(
+    "--batch",
+    is_flag=True,
+    default=False,
+    help=(
+        "Submit all prompts as one provider batch job (cheaper, but may take minutes). "
+        "Anthropic only; other providers warn and fall back to live calls."
+    ),
+)
 @click.argument(
     "path",
     type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
     default=".",
 )
-def cli(path: Path, models: tuple[str], overwrite: bool, skip_tests: bool) -> None:
+def cli(
+    path: Path,
+    models: tuple[str],
+    overwrite: bool,
+    skip_tests: bool,
+    jobs: int,
+    no_cache: bool,
+    batch: bool,
+) -> None:
+    if no_cache:
+        RESPONSE_CACHE.disable()
+
     selected = {m.strip() for chunk in models for m in chunk.split(",")} if models else None
 
     models_root = pathing.find_models_root(path)
@@ -65,68 +176,98 @@ def cli(path: Path, models: tuple[str], overwrite: bool, skip_tests: bool) -> No
         sys.exit(1)
 
     llm = get_provider_class()()
-    updates: Dict[Path, List[Dict[str, Any]]] = {}
+    if batch and type(llm).generate_batch is LLMProvider.generate_batch:
+        click.echo(
+            f"⚠️  {type(llm).__name__} has no batch API; --batch falls back to live calls.",
+            err=True,
+        )
+    # finished model entries, keyed by SQL content; shares ResponseCache's layout
+    sql_cache = (
+        ResponseCache(project_root / ".dbt-schema-gen-cache") if RESPONSE_CACHE.enabled else None
+    )
+    todo: List[Path] = []
+    pending: List[Tuple[Path, str]] = []
+    cache_keys: Dict[Path, str] = {}
+    results: Dict[Path, List[Dict[str, Any]]] = {}
 
     for sql in sorted(sql_paths):
-        folder = sql.parent
-        schema_path = folder / "schema.yml"
-        if schema_path.exists():
-            doc = yaml.safe_load(schema_path.read_text())
-            existing_by_name = {m["name"]: m for m in doc.get("models", [])}
+        schema_path = sql.parent / "schema.yml"
+        if not overwrite and schema_path.exists():
+            existing_cols = _load_existing(schema_path, schema_path.stat().st_mtime_ns)
         else:
-            existing_by_name = {}
-
-        inferred_cols = set(extract_columns_from_sql(sql))
-        if (
-            not overwrite
-            and sql.stem in existing_by_name
-            and inferred_cols == {c["name"] for c in existing_by_name[sql.stem]["columns"]}
-        ):
+            existing_cols = {}
+
+        sql_text = sql.read_text()  # read once; reused for parsing and the prompt
+        inferred_cols = parse_columns(sql_text)
+        if existing_cols.get(sql.stem) == frozenset(inferred_cols):
             click.echo(f"⏭️  {sql.relative_to(project_root)} (columns unchanged)")
             continue
 
-        click.echo(f"↗️  {sql.relative_to(project_root)}")
-
-        sector = get_metadata_from_path(sql)["sector"] or "unknown"
-        src = models_root / sector / f"{sector}_sources.yml"
-        if not src.exists():
-            alts = list(folder.glob("*_sources.yml"))
-            src = alts[0] if alts else None
+        todo.append(sql)
+        sector, sources = _sources_for(sql, models_root)
+        if sql_cache is not None:
+            key = _sql_cache_key(sql, sql_text, sources, llm, skip_tests=skip_tests)
+            hit = None if overwrite else sql_cache.get(key)  # -o: rebuild, then re-store
+            if hit is not None:
+                res = _canonise_reply(sql, hit, skip_tests=skip_tests)
+                if res is not None:
+                    click.echo(f"♻️  {sql.relative_to(project_root)} (cached)")
+                    results[sql] = res
+                    continue
+                sql_cache.delete(key)
+            cache_keys[sql] = key
 
+        click.echo(f"↗️  {sql.relative_to(project_root)}")
         prompt = build_prompt(
             model_name=sql.stem,
             sector=sector,
-            sql_content=sql.read_text(),
-            columns=list(inferred_cols),
-            sources_yaml=src.read_text() if src else "",
+            sql_content=sql_text,
+            columns=inferred_cols,
+            sources_yaml=sources,
         )
+        pending.append((sql, prompt))
 
-        try:
-            raw_reply = llm.generate(prompt)
-            sanitized = yaml_tools.sanitize_yaml(raw_reply)
-            normalized = yaml_tools.normalize_schema_yaml(sanitized)
-            parsed = yaml.safe_load(normalized)
-        except Exception as exc:
-            click.echo(f"⚠️  skipping {sql.name}: {exc}", err=True)
-            continue
+    if pending:
+        # live calls fan out concurrently (LLMProvider.generate_many), at most
+        # -j in flight; the AIMD controller lowers that cap while the provider
+        # returns 429s.  --batch uses the provider's batch API where it has one.
+        AIMD.configure(jobs)
+        prompts = [prompt for _, prompt in pending]
+        replies = llm.generate_batch(prompts) if batch else llm.generate_many(prompts)
+        for (sql, prompt), reply in zip(pending, replies):
+            if isinstance(reply, Exception):
+                click.echo(f"⚠️  skipping {sql.name}: {reply}", err=True)
+                continue
+            res = _canonise_reply(sql, reply, skip_tests=skip_tests)
+            if res is not None:
+                results[sql] = res
+            else:
+                RESPONSE_CACHE.forget(llm, prompt)  # retry the LLM next run
 
-        blocks = parsed["models"] if isinstance(parsed, dict) and "models" in parsed else [parsed]
-        canonised = [
-            tests.canonise_model(b, sql.stem, strip_tests=skip_tests) for b in blocks
-        ]
-        updates.setdefault(folder, []).extend(canonised)
+    if sql_cache is not None:
+        for sql, _ in pending:
+            if sql in results:
+                sql_cache.set(cache_keys[sql], _dump_models(results[sql]))
+
+    # merge in path order so output does not depend on completion order
+    # keyed by model name: O(1) de-dup per insert, last definition wins
+    updates: Dict[Path, Dict[str, Dict[str, Any]]] = {}
+    for sql in todo:
+        if sql in results:
+            acc = updates.setdefault(sql.parent, {})
+            for m in results[sql]:
+                acc[m["name"]] = m
 
     # merge + write
     for folder, new_models in updates.items():
         path_schema = folder / "schema.yml"
         if path_schema.exists():
-            doc = yaml.safe_load(path_schema.read_text())
+            doc = yaml_tools.load_yaml(path_schema.read_text())
             current = {m["name"]: m for m in doc.get("models", [])}
         else:
             current = {}
 
-        for nm in new_models:
-            current[nm["name"]] = nm
+        current.update(new_models)
 
         # pretty dump
         yaml_tools.dump_yaml({"version": 2, "models": list(current.values())}, path_schema)
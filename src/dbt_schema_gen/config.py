@@ -7,6 +7,9 @@ Simple .env-driven configuration helper
 * `ANTHROPIC_API_KEY`, `ANTHROPIC_MODEL`, `ANTHROPIC_TEMPERATURE`
 """
 
+from __future__ import annotations
+
+import functools
 import os
 from importlib import import_module
 from pathlib import Path
@@ -25,10 +28,20 @@ def getenv(key: str, default=None, *, required: bool = False):
     return value
 
 
-def get_provider_class():
-    """Dynamically import the active provider based on LLM_PROVIDER."""
-    provider = getenv("LLM_PROVIDER", "openai").lower()
-    module_name = f"dbt_schema_gen.llm.{provider}_provider"
+# built-in providers; anything else is resolved by naming convention
+_PROVIDERS = {
+    "openai": ("dbt_schema_gen.llm.openai_provider", "OpenaiProvider"),
+    "anthropic": ("dbt_schema_gen.llm.anthropic_provider", "AnthropicProvider"),
+    "gemini": ("dbt_schema_gen.llm.gemini_provider", "GeminiProvider"),
+}
+
+
+@functools.cache
+def _load_provider(provider: str):
+    module_name, class_name = _PROVIDERS.get(
+        provider,
+        (f"dbt_schema_gen.llm.{provider}_provider", f"{provider.capitalize()}Provider"),
+    )
     try:
         module = import_module(module_name)
     except ModuleNotFoundError as exc:
@@ -36,5 +49,12 @@ def get_provider_class():
             f"No provider named '{provider}'. "
             "Check LLM_PROVIDER or add your own module in dbt_schema_gen.llm.*"
         ) from exc
-    class_name = f"{provider.capitalize()}Provider"
     return getattr(module, class_name)
+
+
+def get_provider_class(provider: str | None = None):
+    """
+    Return the provider class for *provider* (default: ``LLM_PROVIDER``).
+    Resolved classes are cached, so repeat calls skip the import machinery.
+    """
+    return _load_provider((provider or getenv("LLM_PROVIDER", "openai")).lower())
@@ -1,6 +1,9 @@
 """
 Utility functions to pull metadata out of dbt SQL models.
 Mostly carried over from the original script but split into a module.
+
+``parse_*`` helpers work on already-read SQL text; the ``extract_*``
+variants are thin wrappers that read the file first.
 """
 
 from __future__ import annotations
@@ -10,73 +13,92 @@ import re
 from pathlib import Path
 from typing import Dict, List
 
-import sqlparse
-
 # --- regex patterns -------------------------------------------------------
 
 COMMENT_DESCRIPTION_PATTERN = re.compile(
     r"--\s*@column\s+(?P<col_name>\w+)\s*:\s*(?P<description>.*)$",
-    re.IGNORECASE,
+    re.IGNORECASE | re.MULTILINE,
 )
 JINJA_COMMENT_DESCRIPTION_PATTERN = re.compile(
     r"{#\s*@column\s+(?P<col_name>\w+)\s*:\s*(?P<description>.*?)#}",
     re.IGNORECASE | re.DOTALL,
 )
 REF_PATTERN = re.compile(r"ref\(['\"]([^'\"]+)['\"]\)")
-
+_SELECT_FROM_RE = re.compile(r"SELECT\s+(.*?)\s+FROM", re.I | re.S)
+_ALIAS_RE = re.compile(r"\s+AS\s+([`\"\[\]\w]+)$", re.I)
+_SPLIT_RE = re.compile(r"[\s\.]+")
+_PAREN_COMMA_RE = re.compile(r"[(),]")
 
 # --- helpers --------------------------------------------------------------
 
-def extract_column_comments(sql_file_path: Path) -> Dict[str, str]:
+def parse_column_comments(sql_text: str) -> Dict[str, str]:
     """Return ``{column: description}`` discovered from ``-- @column ...``."""
-    text = sql_file_path.read_text()
-    matches = COMMENT_DESCRIPTION_PATTERN.findall(text) + JINJA_COMMENT_DESCRIPTION_PATTERN.findall(text)
+    matches = COMMENT_DESCRIPTION_PATTERN.findall(sql_text) + JINJA_COMMENT_DESCRIPTION_PATTERN.findall(sql_text)
     return {col.strip(): desc.strip() for col, desc in matches}
 
 
-def extract_references(sql_file_path: Path) -> List[str]:
+def extract_column_comments(sql_file_path: Path) -> Dict[str, str]:
+    """Path variant of :func:`parse_column_comments`."""
+    return parse_column_comments(sql_file_path.read_text())
+
+
+def parse_references(sql_text: str) -> List[str]:
     """Return list of dbt ``ref()`` targets."""
-    return REF_PATTERN.findall(sql_file_path.read_text())
+    return REF_PATTERN.findall(sql_text)
+
+
+def extract_references(sql_file_path: Path) -> List[str]:
+    """Path variant of :func:`parse_references`."""
+    return parse_references(sql_file_path.read_text())
 
 
 def split_on_top_level_comma(expr: str) -> List[str]:
-    """Split a SQL expression on *top-level* commas."""
-    out, buf, depth = [], [], 0
-    for ch in expr:
+    """
+    Split a SQL expression on *top-level* commas.
+
+    Only parentheses and commas affect the result, so the regex engine skips
+    every other character instead of the interpreter visiting each one.
+    """
+    out, depth, start = [], 0, 0
+    for m in _PAREN_COMMA_RE.finditer(expr):
+        ch = m.group()
         if ch == "(":
             depth += 1
         elif ch == ")":
             depth -= 1
-        elif ch == "," and depth == 0:
-            out.append("".join(buf).strip())
-            buf = []
-            continue
-        buf.append(ch)
-    if buf:
-        out.append("".join(buf).strip())
+        elif depth == 0:
+            out.append(expr[start : m.start()].strip())
+            start = m.end()
+    if start < len(expr):
+        out.append(expr[start:].strip())
     return out
 
 
-def extract_columns_from_sql(sql_file_path: Path) -> List[str]:
-    """Very lightweight select-list parser – good enough for prompts."""
-    sql = sql_file_path.read_text()
-    columns: set[str] = set()
+def parse_columns(sql_text: str) -> List[str]:
+    """
+    Very lightweight select-list parser – good enough for prompts.
 
-    for statement in sqlparse.parse(sql):
-        for token in statement.tokens:
-            if token.ttype is sqlparse.tokens.DML and token.value.upper() == "SELECT":
-                match = re.search(r"SELECT\s+(.*?)\s+FROM", str(statement), re.I | re.S)
-                if match:
-                    for col_expr in split_on_top_level_comma(match.group(1)):
-                        col_expr = col_expr.strip()
-                        alias = re.search(r"\s+AS\s+([`\"\[\]\w]+)$", col_expr, re.I)
-                        name = alias.group(1) if alias else re.split(r"[\s\.]+", col_expr)[-1]
-                        name = name.strip(' "\'`[]()')
-                        if name and not name.startswith("("):
-                            columns.add(name)
+    Only the first ``SELECT ... FROM`` span is inspected; dbt models are a
+    single statement, so a full sqlparse token tree buys nothing here.
+    """
+    columns: set[str] = set()
+    match = _SELECT_FROM_RE.search(sql_text)
+    if match:
+        for col_expr in split_on_top_level_comma(match.group(1)):
+            col_expr = col_expr.strip()
+            alias = _ALIAS_RE.search(col_expr)
+            name = alias.group(1) if alias else _SPLIT_RE.split(col_expr)[-1]
+            name = name.strip(' "\'`[]()')
+            if name and not name.startswith("("):
+                columns.add(name)
     return sorted(columns)
 
 
+def extract_columns_from_sql(sql_file_path: Path) -> List[str]:
+    """Path variant of :func:`parse_columns`."""
+    return parse_columns(sql_file_path.read_text())
+
+
 def get_metadata_from_path(path: Path) -> dict:
     """
     Infer sector & tag list from *models/**/* path.
@@ -1,44 +1,105 @@
 """
-Very light Anthropic wrapper.  Requires anthropic>=0.25.
+Very light Anthropic wrapper.  Requires anthropic>=0.40.
 
 Set:
     ANTHROPIC_API_KEY
     ANTHROPIC_MODEL         – default: claude-3-opus-20240229
     ANTHROPIC_TEMPERATURE   – default: 0.3
+    ANTHROPIC_BATCH_POLL    – seconds between batch status polls, default: 10
+
+The static instructions are sent as a system block and, together with the
+sector sources YAML at the head of the user turn, marked with
+`cache_control` so Anthropic reuses their prefill across models instead of
+billing it in full on every call.
+
+`generate_batch` uses the Message Batches API (half price, asynchronous).
 """
 
 from __future__ import annotations
 
-import anthropic
-from anthropic import RateLimitError
+import time
+from typing import Any, Dict, List, Union
 
 from ..config import getenv
-from ..utils.rate_limiter import retry_on_rate_limit
+from ..renderer import split_preamble, split_prompt
+from ..utils.rate_limiter import retry_on_rate_limit, TOKEN_BUCKET
+from ..utils.response_cache import RESPONSE_CACHE
 from .base import LLMProvider
 
 _SYSTEM = "You are a meticulous analytics engineer. Return ONLY valid YAML; no comments or markdown."
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _rate_limit_errors() -> tuple[type[Exception], ...]:
+    from anthropic import RateLimitError
+
+    return (RateLimitError,)
 
 
 class AnthropicProvider(LLMProvider):
     def __init__(self, *, model: str | None = None, temperature: float | None = None):
+        import anthropic  # imported lazily: the SDK is slow to load
+
         self.client = anthropic.Anthropic(api_key=getenv("ANTHROPIC_API_KEY", required=True))
         self.model = model or getenv("ANTHROPIC_MODEL", "claude-3-sonnet-20240229")
         self.temperature = float(temperature or getenv("ANTHROPIC_TEMPERATURE", 0.3))
 
+    def _params(self, prompt: str) -> Dict[str, Any]:
+        preamble, context = split_preamble(prompt)
+        system = [{"type": "text", "text": _SYSTEM}]
+        if preamble:
+            system.append({"type": "text", "text": preamble})
+        system[-1]["cache_control"] = _EPHEMERAL
+
+        stable, dynamic = split_prompt(context)
+        content = [{"type": "text", "text": stable, "cache_control": _EPHEMERAL}]
+        if dynamic:
+            content.append({"type": "text", "text": dynamic})
+        return {
+            "model": self.model,
+            "temperature": self.temperature,
+            "system": system,
+            "messages": [{"role": "user", "content": content}],
+            "max_tokens": 4096,
+        }
+
     def _raw_generate(self, prompt: str) -> str:
-        msg = self.client.messages.create(
-            model=self.model,
-            temperature=self.temperature,
-            system=_SYSTEM,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=4096,
-        )
+        msg = self.client.messages.create(**self._params(prompt))
         return msg.content[0].text.strip()
 
+    @RESPONSE_CACHE.memoize
     @retry_on_rate_limit(
-        errors=(RateLimitError,),
+        errors=_rate_limit_errors,
         max_retries_env="ANTHROPIC_MAX_RETRIES",
         default_max_retries=3,
     )
     def generate(self, prompt: str) -> str:  # type: ignore[override]
         return self._raw_generate(prompt)
+
+    def generate_batch(self, prompts: List[str]) -> List[Union[str, Exception]]:
+        """Submit uncached prompts as one Message Batch and poll until it ends."""
+        out: List[Union[str, Exception]] = [RESPONSE_CACHE.lookup(self, p) for p in prompts]
+        todo = [i for i, hit in enumerate(out) if hit is None]
+        if not todo:
+            return out
+
+        TOKEN_BUCKET.consume()
+        batch = self.client.messages.batches.create(
+            requests=[{"custom_id": str(i), "params": self._params(prompts[i])} for i in todo]
+        )
+        poll = float(getenv("ANTHROPIC_BATCH_POLL", 10))
+        while batch.processing_status != "ended":
+            time.sleep(poll)
+            batch = self.client.messages.batches.retrieve(batch.id)
+
+        for i in todo:
+            out[i] = RuntimeError("missing from batch results")
+        for entry in self.client.messages.batches.results(batch.id):
+            i = int(entry.custom_id)
+            if entry.result.type == "succeeded":
+                reply = entry.result.message.content[0].text.strip()
+                RESPONSE_CACHE.store(self, prompts[i], reply)
+                out[i] = reply
+            else:
+                out[i] = RuntimeError(f"batch request {entry.result.type}")
+        return out
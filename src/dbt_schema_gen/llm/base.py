@@ -1,4 +1,8 @@
 import abc
+import asyncio
+from typing import List, Union
+
+from ..utils.rate_limiter import AIMD
 
 
 class LLMProvider(abc.ABC):
@@ -7,3 +11,50 @@ class LLMProvider(abc.ABC):
     @abc.abstractmethod
     def generate(self, prompt: str) -> str:  # pragma: no cover
         """Return the assistant's plain-text reply."""
+
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Async `generate`.  The default runs the sync call on a worker thread;
+        providers with a native async client override this.
+        """
+        return await asyncio.to_thread(self.generate, prompt)
+
+    async def aclose(self) -> None:
+        """
+        Release loop-bound resources (e.g. async HTTP pools).  Called once
+        all `agenerate` calls of an event loop are done; a no-op by default.
+        """
+
+    def generate_many(self, prompts: List[str]) -> List[Union[str, Exception]]:
+        """
+        Reply to many prompts by fanning out one request per prompt.
+
+        Prompts are never concatenated into a single request: decoding is
+        autoregressive, so one reply covering N models costs N× the output
+        latency, whereas N parallel requests overlap and finish in roughly
+        the time of the slowest one.  Do not "optimise" this by merging.
+
+        A failed prompt yields its exception instead of a string.
+        """
+
+        async def one(prompt: str) -> str:
+            async with AIMD.slot():
+                return await self.agenerate(prompt)
+
+        async def fan_out() -> List[Union[str, Exception]]:
+            try:
+                return await asyncio.gather(*map(one, prompts), return_exceptions=True)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(fan_out())
+
+    def generate_batch(self, prompts: List[str]) -> List[Union[str, Exception]]:
+        """
+        Reply to many prompts at once, in order.
+
+        A failed prompt yields its exception instead of a string.  The default
+        is `generate_many`; providers with a native batch API (cheaper, but
+        asynchronous) override this.
+        """
+        return self.generate_many(prompts)
@@ -10,12 +10,13 @@ Environment:
 
 from __future__ import annotations
 
+import functools
 import re
-import google.generativeai as genai
-from google.api_core import exceptions as gexc  # type: ignore
 
 from ..config import getenv
+from ..renderer import _PREAMBLE, split_preamble
 from ..utils.rate_limiter import retry_on_rate_limit
+from ..utils.response_cache import RESPONSE_CACHE
 from .base import LLMProvider
 
 _SYSTEM_PROMPT = (
@@ -24,33 +25,106 @@ _SYSTEM_PROMPT = (
 )
 
 
+def _rate_limit_errors() -> tuple[type[Exception], ...]:
+    from google.api_core import exceptions as gexc  # type: ignore
+
+    return (gexc.ResourceExhausted,)
+
+
+_RETRY_DELAY_RE = re.compile(r"retry_delay\s*{\s*seconds:\s*(\d+)", re.ASCII)
+
+
 def _gemini_delay(exc: Exception, attempt: int) -> float:
     """Use retry_delay hint if present, else exponential."""
-    m = re.search(r"retry_delay\s*{\s*seconds:\s*(\d+)", str(exc))
+    # structured RetryInfo first: no multi-KB str(exc), immune to message format
+    try:
+        from google.rpc.error_details_pb2 import RetryInfo  # type: ignore
+    except ImportError:  # pragma: no cover - ships with google-api-core
+        RetryInfo = None
+    if RetryInfo is not None:
+        for detail in getattr(exc, "details", None) or ():
+            if isinstance(detail, RetryInfo):
+                delay = detail.retry_delay
+                return delay.seconds + delay.nanos / 1e9
+
+    try:
+        m = _RETRY_DELAY_RE.search(str(exc))
+    except Exception:
+        m = None
     return int(m.group(1)) if m else 2**attempt
 
 
+def _chunk_text(chunk) -> str:
+    """
+    Text of one streamed chunk.  Only chunks with no candidate parts (e.g. a
+    trailing metadata chunk) are skipped; anything else, such as a blocked
+    candidate, raises from ``chunk.text`` as a non-streamed reply would.
+    """
+    candidates = chunk.candidates
+    if not candidates or not candidates[0].content.parts:
+        return ""
+    return chunk.text
+
+
+def _joined(texts: list[str]) -> str:
+    text = "".join(texts).strip()
+    if not text:
+        raise ValueError("Gemini returned an empty reply")
+    return text
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_model(name: str):
+    """One `GenerativeModel` per model name; construction is not cheap."""
+    import google.generativeai as genai
+
+    # the static instructions go in system_instruction; prompts then only
+    # carry their Context section
+    return genai.GenerativeModel(name, system_instruction=f"{_SYSTEM_PROMPT}\n\n{_PREAMBLE}")
+
+
 class GeminiProvider(LLMProvider):
     def __init__(self, *, model: str | None = None, temperature: float | None = None):
+        import google.generativeai as genai  # imported lazily: the SDK is slow to load
+
         genai.configure(api_key=getenv("GEMINI_API_KEY", required=True))
         self.model_name = model or getenv("GEMINI_MODEL", "gemini-1.5-flash")
         self.temperature = float(temperature or getenv("GEMINI_TEMPERATURE", 0.3))
-        self._model = genai.GenerativeModel(self.model_name)
+        self._model = _shared_model(self.model_name)
+
+    # raw calls (streamed; chunks are joined once the reply is complete)
+    def _generation_config(self) -> dict:
+        return {"temperature": self.temperature, "max_output_tokens": 4096}
 
-    # raw call
     def _raw_generate(self, prompt: str) -> str:
         resp = self._model.generate_content(
-            prompt,
-            generation_config={"temperature": self.temperature, "max_output_tokens": 4096},
+            prompt, generation_config=self._generation_config(), stream=True
+        )
+        return _joined([_chunk_text(c) for c in resp])
+
+    async def _raw_agenerate(self, prompt: str) -> str:
+        resp = await self._model.generate_content_async(
+            prompt, generation_config=self._generation_config(), stream=True
         )
-        return resp.text.strip()
+        return _joined([_chunk_text(c) async for c in resp])
 
     # public API
+    @RESPONSE_CACHE.memoize
     @retry_on_rate_limit(
-        errors=(gexc.ResourceExhausted,),
+        errors=_rate_limit_errors,
         max_retries_env="GEMINI_MAX_RETRIES",
         default_max_retries=1,        # one extra try is enough for free tier
         get_delay=_gemini_delay,
     )
     def generate(self, prompt: str) -> str:  # type: ignore[override]
-        return self._raw_generate(f"{_SYSTEM_PROMPT}\n\n{prompt}")
+        return self._raw_generate(split_preamble(prompt)[1])
+
+    @RESPONSE_CACHE.memoize
+    @retry_on_rate_limit(
+        errors=_rate_limit_errors,
+        max_retries_env="GEMINI_MAX_RETRIES",
+        default_max_retries=1,
+        get_delay=_gemini_delay,
+    )
+    async def agenerate(self, prompt: str) -> str:  # type: ignore[override]
+        return await self._raw_agenerate(split_preamble(prompt)[1])
@@ -9,34 +9,111 @@ Set environment variables:
 
 from __future__ import annotations
 
-import openai
-from openai import RateLimitError
+import functools
 
 from ..config import getenv
+from ..renderer import split_preamble
 from ..utils.rate_limiter import retry_on_rate_limit
+from ..utils.response_cache import RESPONSE_CACHE
 from .base import LLMProvider
 
 _SYSTEM = "You are a meticulous analytics engineer. Return ONLY valid YAML; no comments or markdown."
 
 
+def _rate_limit_errors() -> tuple[type[Exception], ...]:
+    from openai import RateLimitError
+
+    return (RateLimitError,)
+
+
+def _http_options() -> dict:
+    import httpx
+
+    return {
+        "limits": httpx.Limits(
+            max_keepalive_connections=64, max_connections=128, keepalive_expiry=60
+        ),
+        "timeout": httpx.Timeout(60.0, connect=10.0),
+    }
+
+
+# one pooled client per process, shared by every provider instance
+@functools.lru_cache(maxsize=None)
+def _shared_client(api_key: str):
+    import openai  # imported lazily: the SDK is slow to load
+
+    return openai.OpenAI(api_key=api_key, http_client=openai.DefaultHttpxClient(**_http_options()))
+
+
 class OpenaiProvider(LLMProvider):
     def __init__(self, *, model: str | None = None, temperature: float | None = None):
-        self.client = openai.OpenAI(api_key=getenv("OPENAI_API_KEY", required=True))
+        self._api_key = getenv("OPENAI_API_KEY", required=True)
+        self.client = _shared_client(self._api_key)
+        self._aclient = None
         self.model = model or getenv("OPENAI_MODEL", "gpt-3.5-turbo-0125")
         self.temperature = float(temperature or getenv("OPENAI_TEMPERATURE", 0.3))
 
+    @property
+    def aclient(self):
+        """Async client, created on first use; its pool lives until `aclose`."""
+        if self._aclient is None:
+            import openai
+
+            self._aclient = openai.AsyncOpenAI(
+                api_key=self._api_key,
+                http_client=openai.DefaultAsyncHttpxClient(**_http_options()),
+            )
+        return self._aclient
+
+    async def aclose(self) -> None:
+        # async pools are bound to their event loop: close before it ends
+        if self._aclient is not None:
+            aclient, self._aclient = self._aclient, None
+            await aclient.close()
+
+    def _messages(self, prompt: str) -> list[dict[str, str]]:
+        # static instructions live in the system message, so every call shares
+        # the same leading tokens and hits OpenAI's automatic prefix cache
+        preamble, context = split_preamble(prompt)
+        system = f"{_SYSTEM}\n\n{preamble}" if preamble else _SYSTEM
+        return [{"role": "system", "content": system}, {"role": "user", "content": context}]
+
+    # streamed, so long replies are read as they are produced; fence stripping
+    # happens once on the joined text (yaml_tools.parse_llm_yaml)
     def _raw_generate(self, prompt: str) -> str:
-        resp = self.client.chat.completions.create(
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            temperature=self.temperature,
+            messages=self._messages(prompt),
+            stream=True,
+        )
+        buf = [c.choices[0].delta.content or "" for c in stream if c.choices]
+        return "".join(buf).strip()
+
+    async def _raw_agenerate(self, prompt: str) -> str:
+        stream = await self.aclient.chat.completions.create(
             model=self.model,
             temperature=self.temperature,
-            messages=[{"role": "system", "content": _SYSTEM}, {"role": "user", "content": prompt}],
+            messages=self._messages(prompt),
+            stream=True,
         )
-        return resp.choices[0].message.content.strip()
+        buf = [c.choices[0].delta.content or "" async for c in stream if c.choices]
+        return "".join(buf).strip()
 
+    @RESPONSE_CACHE.memoize
     @retry_on_rate_limit(
-        errors=(RateLimitError,),
+        errors=_rate_limit_errors,
         max_retries_env="OPENAI_MAX_RETRIES",
         default_max_retries=3,
     )
     def generate(self, prompt: str) -> str:  # type: ignore[override]
         return self._raw_generate(prompt)
+
+    @RESPONSE_CACHE.memoize
+    @retry_on_rate_limit(
+        errors=_rate_limit_errors,
+        max_retries_env="OPENAI_MAX_RETRIES",
+        default_max_retries=3,
+    )
+    async def agenerate(self, prompt: str) -> str:  # type: ignore[override]
+        return await self._raw_agenerate(prompt)
@@ -1,110 +1,75 @@
 """
 Prompt builder and response post-processing.
-If you want more advanced formatting, swap in a Jinja template here.
+The static instructions live in `prompt.txt`; edit them there.
+
+The prompt is ordered stable-first: instructions and the sector sources
+YAML (shared by every model in a sector) come before the per-model SQL,
+so providers can cache the common prefix.  `split_prompt` returns the two
+halves; `split_preamble` peels off the static instructions so providers
+can send them as the system message.
 """
 
 from __future__ import annotations
 
-from textwrap import dedent
-from typing import List
+import hashlib
+from importlib import resources
+from typing import List, Tuple
+
+# first heading of the per-model (uncacheable) part of the prompt
+_DYNAMIC_MARKER = "### Model name"
 
-def build_prompt(
-    *,
-    model_name: str,
-    sector: str | None,
-    sql_content: str,
-    columns: List[str],
-    sources_yaml: str | None,
-) -> str:
-    """Return the string sent to the LLM."""
-    return dedent(
-        f"""
-        You are an expert analytics engineer working on a dbt project.
 
-        Produce a COMPLETE dbt schema.yml entry for the model `{model_name}`.
+def split_prompt(prompt: str) -> Tuple[str, str]:
+    """Return ``(stable_prefix, per_model_tail)``; tail is empty if no marker."""
+    idx = prompt.find(_DYNAMIC_MARKER)
+    if idx == -1:
+        return prompt, ""
+    return prompt[:idx], prompt[idx:]
 
-        Hard requirements
-        -----------------
-        • Output YAML ONLY — no prose, no Markdown fences, no comments.
-        • Must start with `version: 2`.
-        • Top-level key MUST be `models:` with a single list item for this model.
-        • The model item MUST include:
-          - name: {model_name}
-          - description: (helpful, business-facing; use a folded block scalar `>`; no blank lines)
-          - config: (include `access: public`; may include `tags` and `materialized` if clearly inferable)
-          - meta: (include `owner`, `authoritative: false`, `generated_by: "schema-writer"`;
-                   add `inference_notes` only if something was inferred)
-          - columns: (list EVERY column that appears in the SELECT, in exact order; do not invent columns)
-        • Do NOT include example blocks or placeholders. Emit only the final YAML.
 
-        Columns — required keys per column
-        ----------------------------------
-        For each column under `columns:` output:
-          - name
-          - description (concise; note units/range if numeric; use a single line or folded scalar `>` without blank lines)
-          - data_type (infer if missing; prefer warehouse-native types consistent with the sources)
-          - tests (YAML list) — MINIMIZE tests:
-              · Only add `not_null` for keys and timestamps that are obviously non-null.
-              · Only add `unique` for an obvious single-column primary key.
-              · If uncertain, OMIT tests for that column entirely.
+def split_preamble(prompt: str) -> Tuple[str, str]:
+    """Return ``(instructions, context)``; instructions are empty for foreign prompts."""
+    if prompt.startswith(_PREAMBLE):
+        return _PREAMBLE, prompt[len(_PREAMBLE):]
+    return "", prompt
 
-        Tests — allowed forms (strict)
-        ------------------------------
-        • Put tests ONLY under the column’s `tests:` list (correct indentation).
-        • Allowed simple tests: `not_null`, `unique`.
-        • Relationships test is allowed ONLY when clearly inferable AND must be nested exactly as:
-            tests:
-              - relationships:
-                  to: ref('target_model')            # OR: source('source_name','table_name')
-                  field: target_pk
-          (The value of `to` MUST be a single scalar string using ref()/source(); never `to: source:`.)
-        • Composite uniqueness goes at the MODEL level (not per column) ONLY when clearly inferable:
-            tests:
-              - dbt_utils.unique_combination_of_columns:
-                  combination_of_columns: ["col_a","col_b"]
-                  severity: error
-        • Do not repeat the same test for a column. A column may have at most one `not_null` and at most one `unique`.
 
-        Inference heuristics
-        --------------------
-        • Columns source of truth (in order of precedence):
-          1) “Columns parsed from the SELECT clause” → use exactly these names and this order.
-          2) If empty, parse from the SQL and infer carefully.
-        • Primary key:
-          - If a single obvious key exists (e.g., `*_id`, `transaction_hash`), add `unique` + `not_null`.
-          - If a multi-column natural key is obvious (e.g., `block_number` + `log_index`), add the model-level
-            `dbt_utils.unique_combination_of_columns`. If not obvious, skip.
-        • Foreign keys / relationships:
-          - Only add a `relationships` test if the SQL references `ref()`/`source()` AND the FK is clear by name.
-          - Otherwise omit it.
-        • Data types:
-          - Prefer `UInt64`, `Float64`, `String`, `DateTime` / `DateTime64(0, 'UTC')`, `JSON` consistent with provided sources YAML.
-          - Hashes/addresses → `String`. Amounts in wei/gwei → `UInt64` or `String` if overflow risk.
-        • Enums:
-          - Only add `accepted_values` when explicit values are evident; otherwise omit.
-        • Timestamps:
-          - `*_timestamp`, `created_at`, `updated_at` → `DateTime` or `DateTime64(0, 'UTC')`.
-        • Quoting:
-          - If a name is a reserved keyword or contains hyphens/spaces, add `quote: true` at the model level.
+# static instructions (prompt.txt, authored left-aligned); every prompt starts with this
+_PREAMBLE = resources.files(__package__).joinpath("prompt.txt").read_text(encoding="utf-8")
 
-        Final output validation (self-check before you answer)
-        ------------------------------------------------------
-        • Ensure the YAML parses and contains exactly: `version: 2` and one `models:` entry.
-        • Ensure there are NO duplicate column names.
-        • Ensure no column has duplicate test macros (e.g., two `not_null`).
-        • Ensure any `relationships.to` is a scalar `ref('...')` or `source('...','...')`, never a nested map.
-        • Ensure descriptions use folded scalars `>` where multiline and contain no empty lines.
-        • Do not include empty strings or trailing blank lines in any scalar.
+# changes whenever the instructions do; part of the CLI's per-model cache key
+_PREAMBLE_VERSION = hashlib.blake2b(_PREAMBLE.encode(), digest_size=8).hexdigest()
 
-        Context
-        -------
-        ### Raw model SQL
-        {sql_content}
+_NO_COLUMNS = "*(parser did not find columns – infer from SQL)*"
 
-        ### Columns parsed from the SELECT clause
-        {", ".join(columns) or "*(parser did not find columns – infer from SQL)*"}
+# per-model Context section, appended to _PREAMBLE
+_CONTEXT = (
+    "### Sector-level sources YAML ({sector}_sources.yml)\n"
+    "{sources_yaml}\n\n"
+    f"{_DYNAMIC_MARKER}\n"
+    "{model_name}\n\n"
+    "### Raw model SQL\n"
+    "{sql_content}\n\n"
+    "### Columns parsed from the SELECT clause\n"
+    "{columns}"
+)
 
-        ### Sector-level sources YAML ({sector or "unknown"}_sources.yml)
-        {sources_yaml or "*no sources file found*"}
-        """
-    ).strip()
+
+def build_prompt(
+    *,
+    model_name: str,
+    sector: str | None,
+    sql_content: str,
+    columns: List[str],
+    sources_yaml: str | None,
+) -> str:
+    """Return the string sent to the LLM."""
+    return _PREAMBLE + _CONTEXT.format_map(
+        {
+            "sector": sector or "unknown",
+            "sources_yaml": sources_yaml or "*no sources file found*",
+            "model_name": model_name,
+            "sql_content": sql_content,
+            "columns": ", ".join(columns) or _NO_COLUMNS,
+        }
+    )
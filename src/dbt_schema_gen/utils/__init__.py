@@ -1,15 +1,30 @@
-from .rate_limiter import retry_on_rate_limit, TOKEN_BUCKET
+from .rate_limiter import retry_on_rate_limit, TOKEN_BUCKET, AIMD, AIMDController
+from .response_cache import ResponseCache, RESPONSE_CACHE
 from .pathing import find_models_root, sql_files
-from .yaml_tools import dump_yaml, sanitize_yaml, normalize_schema_yaml
+from .yaml_tools import (
+    load_yaml,
+    dump_yaml,
+    sanitize_yaml,
+    parse_llm_yaml,
+    normalize_schema,
+    normalize_schema_yaml,
+)
 from .tests import canonise_model
 
 __all__ = [
     "retry_on_rate_limit",
     "TOKEN_BUCKET",
+    "AIMD",
+    "AIMDController",
+    "ResponseCache",
+    "RESPONSE_CACHE",
     "find_models_root",
     "sql_files",
+    "load_yaml",
     "dump_yaml",
     "sanitize_yaml",
+    "parse_llm_yaml",
+    "normalize_schema",
     "normalize_schema_yaml",
     "canonise_model",
 ]
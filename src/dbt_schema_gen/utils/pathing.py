@@ -1,3 +1,5 @@
+import functools
+import os
 from pathlib import Path
 from typing import Iterable
 
@@ -9,7 +11,11 @@ def find_models_root(path: Path) -> Path:
     * If <path>/models exists → user gave project root.
     * Else climb upwards until you hit a directory literally named 'models'.
     """
-    p = path.resolve()
+    return _find_models_root(path.resolve())
+
+
+@functools.lru_cache(maxsize=None)
+def _find_models_root(p: Path) -> Path:
     if (p / "models").is_dir():
         return p / "models"
 
@@ -21,9 +27,21 @@ def find_models_root(path: Path) -> Path:
 
 
 def sql_files(scan_root: Path, selected: set[str] | None) -> Iterable[Path]:
-    """Yield *.sql files under *scan_root* honouring `selected` filter."""
-    for p in scan_root.rglob("*.sql"):
-        if p.name.startswith("_") or p.name.endswith("_tmp.sql"):
-            continue
-        if selected is None or p.stem in selected:
-            yield p
+    """
+    Yield *.sql files under *scan_root* honouring `selected` filter.
+
+    Walks with an explicit `os.scandir` stack and filters on entry names,
+    so a `Path` is only built for files that are actually yielded.
+    """
+    stack = [os.fspath(scan_root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                    continue
+                fn = e.name
+                if not fn.endswith(".sql") or fn.startswith("_") or fn.endswith("_tmp.sql"):
+                    continue
+                if selected is None or fn[:-4] in selected:
+                    yield Path(e.path)
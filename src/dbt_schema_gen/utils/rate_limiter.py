@@ -5,49 +5,153 @@ Shared utilities
 A single place for:
 
 * global TokenBucket rate-limiter (requests-per-minute)
-* retry_on_rate_limit decorator (provider-agnostic)
+* global AIMD concurrency controller (shrinks on 429s, regrows on success)
+* retry_on_rate_limit decorator (provider-agnostic, sync or async)
 """
 
 from __future__ import annotations
 
+import asyncio
 import functools
+import inspect
 import os
 import random
 import threading
 import time
-from typing import Callable, Tuple, Type, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Tuple, Type, Any
 
 
 # ────────────────────────────── bucket ──────────────────────────────
 class _TokenBucket:
+    """
+    Tokens are the permits of a ``BoundedSemaphore(rpm)``.  A daemon thread,
+    started on first use, returns one permit every ``60 / rpm`` seconds (a
+    no-op while the bucket is full), so spare budget is usable as soon as it
+    accrues and no refill arithmetic runs on the caller's side.
+    """
+
     def __init__(self, rpm: int):
         self.capacity = max(1, rpm)
-        self.tokens = self.capacity
-        self.lock = threading.Lock()
-        self.last = time.time()
+        self.interval = 60.0 / self.capacity  # seconds per refilled token
+        self._sem = threading.BoundedSemaphore(self.capacity)
+        self._refiller: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_refiller(self) -> None:
+        if self._refiller is not None:
+            return
+        with self._start_lock:
+            if self._refiller is None:
+                t = threading.Thread(target=self._refill, name="token-bucket-refill", daemon=True)
+                t.start()
+                self._refiller = t
 
     def _refill(self) -> None:
-        now = time.time()
-        if now - self.last >= 60:
-            self.tokens = self.capacity
-            self.last = now
+        while True:
+            time.sleep(self.interval)
+            try:
+                self._sem.release()
+            except ValueError:  # bucket already full
+                pass
 
     def consume(self) -> None:
-        with self.lock:
-            self._refill()
-            if self.tokens == 0:
-                sleep = 60 - (time.time() - self.last)
-                time.sleep(max(0.0, sleep))
-                self._refill()
-            self.tokens -= 1
+        self._ensure_refiller()
+        self._sem.acquire()
+
+    async def aconsume(self) -> None:
+        """
+        Async `consume`: polls with non-blocking takes, so a waiting task stays
+        cancellable (Ctrl-C) instead of parking a worker thread on the semaphore.
+        """
+        self._ensure_refiller()
+        poll = min(self.interval, 0.25)
+        while not self._sem.acquire(blocking=False):
+            await asyncio.sleep(poll)
 
 
 TOKEN_BUCKET = _TokenBucket(int(os.getenv("GLOBAL_MAX_RPM", "10")))
 
+
+# ─────────────────────── AIMD concurrency ───────────────────────────
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease limit on in-flight calls:
+    ``+increase`` per success (up to ``max_limit``), ``×decrease`` per 429
+    (down to 1).  Async callers gate on it with ``async with AIMD.slot()``.
+    """
+
+    def __init__(self, max_limit: int, *, increase: float = 1.0, decrease: float = 0.5):
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.increase = increase
+        self.decrease = decrease
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._cond: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def configure(self, max_limit: int) -> None:
+        with self._lock:
+            self.max_limit = max(1, max_limit)
+            self.limit = float(self.max_limit)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.limit = min(float(self.max_limit), self.limit + self.increase)
+
+    def on_rate_limit(self) -> None:
+        with self._lock:
+            self.limit = max(1.0, self.limit * self.decrease)
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:  # one per event loop
+            self._cond, self._loop = asyncio.Condition(), loop
+        return self._cond
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self._inflight < int(self.limit))
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            async with cond:
+                self._inflight -= 1
+                cond.notify_all()
+
+
+AIMD = AIMDController(int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+
+
+def _retry_after(err: Exception) -> float | None:
+    """Seconds from an HTTP ``Retry-After`` header (OpenAI / Anthropic errors)."""
+    headers = getattr(getattr(err, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):  # absent, or HTTP-date form
+        return None
+
+
+def _backoff(err: Exception, attempt: int, get_delay: Callable[[Exception, int], float] | None) -> float:
+    """Provider hint first, else exponential; plus jitter."""
+    if get_delay:
+        base = get_delay(err, attempt)
+    else:
+        hint = _retry_after(err)
+        base = hint if hint is not None else 2**attempt
+    return base + random.uniform(0, 0.5)
+
+
 # ─────────────────────── retry decorator ────────────────────────────
 def retry_on_rate_limit(
     *,
-    errors: Tuple[Type[Exception], ...],
+    errors: Tuple[Type[Exception], ...] | Callable[[], Tuple[Type[Exception], ...]],
     max_retries_env: str,
     default_max_retries: int = 3,
     get_delay: Callable[[Exception, int], float] | None = None,
@@ -62,21 +166,50 @@ def retry_on_rate_limit(
             get_delay=lambda e, n: e.retry_after or 2**n,
         )
         def generate(...): ...
+
+    *errors* may also be a zero-arg callable returning the tuple, resolved on
+    each call, so providers can import their SDK lazily.  Without *get_delay*
+    the error's ``Retry-After`` header is honoured when present.  Outcomes are
+    reported to the global `AIMD` controller.
     """
     max_retries = int(os.getenv(max_retries_env, default_max_retries))
 
     def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def awrapper(*args, **kwargs):
+                await TOKEN_BUCKET.aconsume()
+                retry_on = errors() if callable(errors) else errors
+                for attempt in range(max_retries + 1):
+                    try:
+                        result = await fn(*args, **kwargs)
+                    except retry_on as err:
+                        AIMD.on_rate_limit()
+                        if attempt == max_retries:
+                            raise
+                        await asyncio.sleep(_backoff(err, attempt, get_delay))
+                    else:
+                        AIMD.on_success()
+                        return result
+
+            return awrapper
+
         @functools.wraps(fn)
         def wrapper(*args, **kwargs):
             TOKEN_BUCKET.consume()
+            retry_on = errors() if callable(errors) else errors
             for attempt in range(max_retries + 1):
                 try:
-                    return fn(*args, **kwargs)
-                except errors as err:
+                    result = fn(*args, **kwargs)
+                except retry_on as err:
+                    AIMD.on_rate_limit()
                     if attempt == max_retries:
                         raise
-                    base = get_delay(err, attempt) if get_delay else 2**attempt
-                    time.sleep(base + random.uniform(0, 0.5))
+                    time.sleep(_backoff(err, attempt, get_delay))
+                else:
+                    AIMD.on_success()
+                    return result
 
         return wrapper
 
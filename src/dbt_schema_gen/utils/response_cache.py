@@ -0,0 +1,166 @@
+"""
+Content-addressed LLM response cache
+====================================
+
+Replies are keyed by ``blake2b(provider | model | temperature | prompt)``
+and kept in two layers:
+
+* an in-process dict (repeat prompts within one run)
+* plain-text files under ``$XDG_CACHE_HOME/dbt-schema-gen`` (across runs)
+
+A hit skips both the network round trip and the global token bucket.
+
+Environment:
+  DBT_SCHEMA_GEN_CACHE      – ``0`` disables the cache (default: ``1``)
+  DBT_SCHEMA_GEN_CACHE_TTL  – seconds before a disk entry expires (default: never)
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+_WS = re.compile(r"\s+")
+
+
+def _default_dir() -> Path:
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "dbt-schema-gen"
+
+
+class ResponseCache:
+    def __init__(self, directory: Path | None = None):
+        self.directory = directory or _default_dir()
+        self._mem: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._disabled = False
+
+    # ─────────────────────────── switches ───────────────────────────
+    @property
+    def enabled(self) -> bool:
+        return not self._disabled and os.getenv("DBT_SCHEMA_GEN_CACHE", "1") != "0"
+
+    def disable(self) -> None:
+        """Bypass the cache for the rest of the process (``--no-cache``)."""
+        self._disabled = True
+
+    # ──────────────────────────── keys ──────────────────────────────
+    @staticmethod
+    def make_key(provider: str, model: str, temperature: float, prompt: str) -> str:
+        """Hash the call parameters; whitespace-only prompt differences share a key."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{provider}|{model}|{temperature}|".encode())
+        h.update(_WS.sub(" ", prompt).strip().encode())
+        return h.hexdigest()
+
+    def _provider_key(self, provider: Any, prompt: str) -> str:
+        model = getattr(provider, "model_name", None) or getattr(provider, "model", "")
+        temperature = getattr(provider, "temperature", None)  # optional on custom providers
+        return self.make_key(type(provider).__name__, model, temperature, prompt)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key[2:]
+
+    # ────────────────────────── storage ─────────────────────────────
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            hit = self._mem.get(key)
+        if hit is not None:
+            return hit
+
+        p = self._path(key)
+        try:
+            ttl = os.getenv("DBT_SCHEMA_GEN_CACHE_TTL")
+            if ttl and time.time() - p.stat().st_mtime > float(ttl):
+                return None
+            hit = p.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        with self._lock:
+            self._mem[key] = hit
+        return hit
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._mem[key] = value
+        p = self._path(key)
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+            tmp.write_text(value, encoding="utf-8")
+            os.replace(tmp, p)  # atomic, so concurrent workers never see partial files
+        except OSError:
+            pass  # a read-only cache dir must never break generation
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._mem.pop(key, None)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    # ───────────────────── provider integration ─────────────────────
+    def lookup(self, provider: Any, prompt: str) -> str | None:
+        """Cached reply for *prompt* on this provider instance, if any."""
+        if not self.enabled:
+            return None
+        return self.get(self._provider_key(provider, prompt))
+
+    def store(self, provider: Any, prompt: str, reply: str) -> None:
+        if self.enabled and reply.strip():  # an empty reply is never worth replaying
+            self.set(self._provider_key(provider, prompt), reply)
+
+    def forget(self, provider: Any, prompt: str) -> None:
+        """Drop a stored reply, e.g. one that turned out not to parse."""
+        if self.enabled and self.covers(provider):
+            self.delete(self._provider_key(provider, prompt))
+
+    def covers(self, provider: Any) -> bool:
+        """True if *provider*'s ``generate`` or ``agenerate`` is memoised here."""
+        cls = type(provider)
+        return any(
+            getattr(getattr(cls, name, None), "__response_cache__", None) is self
+            for name in ("generate", "agenerate")
+        )
+
+    def memoize(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Decorate ``generate(self, prompt)`` or ``async agenerate(self, prompt)``;
+        place it above the retry decorator.
+        """
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def awrapper(provider: Any, prompt: str) -> str:
+                hit = self.lookup(provider, prompt)
+                if hit is not None:
+                    return hit
+                reply = await fn(provider, prompt)
+                self.store(provider, prompt, reply)
+                return reply
+
+            awrapper.__response_cache__ = self  # type: ignore[attr-defined]
+            return awrapper
+
+        @functools.wraps(fn)
+        def wrapper(provider: Any, prompt: str) -> str:
+            hit = self.lookup(provider, prompt)
+            if hit is not None:
+                return hit
+            reply = fn(provider, prompt)
+            self.store(provider, prompt, reply)
+            return reply
+
+        wrapper.__response_cache__ = self  # type: ignore[attr-defined]
+        return wrapper
+
+
+RESPONSE_CACHE = ResponseCache()
@@ -4,7 +4,6 @@ Helpers for normalising / stripping tests in LLM-generated YAML.
 
 from __future__ import annotations
 
-from collections import OrderedDict
 from typing import Any, Dict, List
 
 __all__ = ["canonise_model"]
@@ -42,24 +41,25 @@ _ALIAS_MAP: dict[str, tuple[str, callable[[Any], dict]]] = {
                     lambda v: {"regex": v}),
 }
 
+# lower- and title-case keys: the usual spellings hit without calling .lower()
+_ALIAS_MAP_CI = {**_ALIAS_MAP, **{k.title(): v for k, v in _ALIAS_MAP.items()}}
+
 _UNWANTED = {"version", "schema_version", "model"}
 _KEY_ORDER = ["name", "description", "columns", "tags",
               "refs", "tests", "config"]
 
 
 def _fix_tests(tests: list[Any]) -> list[Any]:
-    """Rewrite LLM aliases to canonical dbt/dbt_utils tests."""
-    fixed = []
-    for t in tests:
-        if isinstance(t, dict) and len(t) == 1:
-            alias, val = next(iter(t.items()))
-            canon = _ALIAS_MAP.get(alias.lower())
+    """Rewrite LLM aliases to canonical dbt/dbt_utils tests (in place)."""
+    get = _ALIAS_MAP_CI.get
+    for i, t in enumerate(tests):
+        if type(t) is dict and len(t) == 1:
+            alias = next(iter(t))
+            canon = get(alias) or get(alias.lower())
             if canon:
                 name, transform = canon
-                fixed.append({name: transform(val)})
-                continue
-        fixed.append(t)
-    return fixed
+                tests[i] = {name: transform(t[alias])}
+    return tests
 
 
 def canonise_model(raw: Dict[str, Any],
@@ -99,7 +99,7 @@ def canonise_model(raw: Dict[str, Any],
             m.pop(k)
 
     # canonical order
-    ordered = OrderedDict()
+    ordered: Dict[str, Any] = {}
     for k in _KEY_ORDER:
         if k in m:
             ordered[k] = m.pop(k)
@@ -8,18 +8,36 @@ from typing import Any
 
 import yaml
 
-__all__ = ["dump_yaml", "sanitize_yaml", "normalize_schema_yaml"]
+try:  # libyaml bindings are ~5x faster; fall back to pure Python if absent
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper  # type: ignore[assignment]
+
+__all__ = [
+    "load_yaml",
+    "dump_yaml",
+    "sanitize_yaml",
+    "parse_llm_yaml",
+    "normalize_schema",
+    "normalize_schema_yaml",
+]
 
 _FENCE = re.compile(r"^\s*```(?:yaml)?\s*|\s*```$", re.MULTILINE)
-_NEED_QUOTE = re.compile(r"(\s*description:\s*)([^\"'][^#]*?:[^\"'].*)$")
+_NEED_QUOTE = re.compile(
+    r"^([ \t]*description:[ \t]*)([^\"'\n][^\n#]*?:[^\"'\n].*)$", re.MULTILINE
+)
+_NL_RE = re.compile(r"\s*\n\s*")
+_WS_RE = re.compile(r"\s{2,}")
+_BLANK_MODEL_RE = re.compile(r"\n(\s*)- name:")
+_VERSION_RE = re.compile(r"^(version:\s*2)\n+", re.MULTILINE)
 
 
 def _squash_description(s: str) -> str:
     """Collapse internal newlines/blank lines; trim; single space between tokens."""
     s = (s or "").strip()
     # remove accidental blank lines / extra spaces
-    s = re.sub(r"\s*\n\s*", " ", s)
-    s = re.sub(r"\s{2,}", " ", s)
+    s = _NL_RE.sub(" ", s)
+    s = _WS_RE.sub(" ", s)
     return s
 
 
@@ -35,7 +53,7 @@ def _dedupe_tests(tests: list[Any] | None) -> list[Any]:
         elif isinstance(t, dict) and len(t) == 1:
             key = next(iter(t))
         else:
-            key = yaml.safe_dump(t, sort_keys=True)
+            key = yaml.dump(t, Dumper=_Dumper, sort_keys=True)
         if key not in seen:
             seen.add(key)
             out.append(t)
@@ -43,52 +61,57 @@ def _dedupe_tests(tests: list[Any] | None) -> list[Any]:
 
 
 def _dedupe_columns(cols: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
-    """Keep only the first definition for each column name; clean descriptions & tests."""
+    """
+    Keep only the first definition for each column name; clean descriptions & tests.
+    Surviving column dicts are cleaned in place (see `normalize_schema`).
+    """
     if not cols:
         return []
     out: list[dict[str, Any]] = []
     seen: set[str] = set()
+    # local bindings: this loop runs once per column of every model
+    sq, dd, seen_add, out_append = _squash_description, _dedupe_tests, seen.add, out.append
     for col in cols:
-        name = (col or {}).get("name")
-        if not name:
+        if type(col) is not dict:
             continue
-        if name in seen:
-            # skip duplicates silently
+        name = col.get("name")
+        if not name or name in seen:
+            # skip nameless and duplicate columns silently
             continue
-        seen.add(name)
+        seen_add(name)
 
-        col = dict(col)
+        desc = col.get("description")
+        if type(desc) is str:
+            col["description"] = sq(desc)
 
-        # Clean description
-        if isinstance(col.get("description"), str):
-            col["description"] = _squash_description(col["description"])
+        tests = col.get("tests")
+        if type(tests) is list:
+            tests = dd(tests)
+            if tests:
+                col["tests"] = tests
+            else:
+                del col["tests"]
 
-        # Clean/dedupe tests
-        if isinstance(col.get("tests"), list):
-            col["tests"] = _dedupe_tests(col["tests"])
-            if not col["tests"]:
-                col.pop("tests", None)
-
-        out.append(col)
+        out_append(col)
     return out
 
 
-def normalize_schema_yaml(text: str) -> str:
-    """
-    Parse YAML text, fix common LLM issues, and dump back to YAML:
-      - collapse description whitespace (model + columns)
-      - dedupe columns within a model (keep first)
-      - dedupe tests per column and at model level
-      - ensure a blank line between models (cosmetic)
-    Returns the normalized YAML string. If parsing fails, returns input text.
+def load_yaml(text: str) -> Any:
+    """`yaml.safe_load` equivalent using the C loader when available."""
+    return yaml.load(text, Loader=_Loader)
+
+
+def normalize_schema(doc: Any) -> Any:
     """
-    try:
-        doc = yaml.safe_load(text)
-    except Exception:
-        return text
+    Object-level core of `normalize_schema_yaml`: fix common LLM issues in
+    an already-parsed schema document.  Anything without a ``models`` list
+    is returned unchanged.
 
+    Model dicts are copied, but surviving column dicts are cleaned in place
+    and shared with the result: pass a copy if *doc* must stay untouched.
+    """
     if not isinstance(doc, dict) or "models" not in doc:
-        return text
+        return doc
 
     models = []
     for m in doc.get("models", []):
@@ -111,46 +134,133 @@ def normalize_schema_yaml(text: str) -> str:
 
         models.append(mm)
 
-    out_obj = {"version": doc.get("version", 2), "models": models}
-    out = yaml.safe_dump(out_obj, sort_keys=False, allow_unicode=True, width=100000)
+    return {"version": doc.get("version", 2), "models": models}
+
+
+def normalize_schema_yaml(text: str) -> str:
+    """
+    Parse YAML text, fix common LLM issues, and dump back to YAML:
+      - collapse description whitespace (model + columns)
+      - dedupe columns within a model (keep first)
+      - dedupe tests per column and at model level
+      - ensure a blank line between models (cosmetic)
+    Returns the normalized YAML string. If parsing fails, returns input text.
+    """
+    try:
+        doc = load_yaml(text)
+    except Exception:
+        return text
+
+    out_obj = normalize_schema(doc)
+    if out_obj is doc:
+        return text
+
+    out = yaml.dump(out_obj, Dumper=_Dumper, sort_keys=False, allow_unicode=True, width=100000)
 
     # Cosmetic: ensure a blank line before each new model entry
-    out = re.sub(r"\n(\s*)- name:", r"\n\n\1- name:", out, count=0)
+    out = _BLANK_MODEL_RE.sub(r"\n\n\1- name:", out)
 
     # Cosmetic: remove accidental blank line after 'version'
-    out = re.sub(r"^(version:\s*2)\n+", r"\1\n", out, flags=re.M)
+    out = _VERSION_RE.sub(r"\1\n", out)
 
     return out
 
 
+def _strip_fences(text: str) -> str:
+    """Drop a wrapping ```yaml fence; plain string ops unless the layout is unusual."""
+    body = text
+    if "```" in text:  # most replies have no fence at all
+        s = text.strip()
+        nl = s.find("\n")
+        if (
+            nl != -1
+            and s.startswith("```")
+            and s.endswith("```")
+            and s.count("```") == 2
+            and s[3:nl].strip() in ("", "yaml")
+        ):
+            body = s[nl + 1 : -3]
+        else:
+            body = _FENCE.sub("", text)
+    if body.lstrip("\r\n")[:1] in (" ", "\t"):
+        body = dedent(body)
+    return body.strip()
+
+
+def _quote_sub(m: re.Match) -> str:
+    return f'{m.group(1)}"{_squash_description(m.group(2))}"'
+
+
+def _quote_descriptions(cleaned: str) -> str:
+    if "description:" not in cleaned:
+        return cleaned
+    return _NEED_QUOTE.sub(_quote_sub, cleaned)
+
+
+def _repair(cleaned: str, err: yaml.YAMLError) -> tuple[str, Any]:
+    """
+    Quote suspicious descriptions and re-parse, returning ``(text, doc)``.
+    Only the line the parser choked on is touched first, then ±2 lines
+    around it, and only then the whole document; the last attempt raises
+    ``yaml.YAMLError`` if it still fails.
+    """
+    mark = getattr(err, "problem_mark", None)
+    if mark is not None:
+        lines = cleaned.split("\n")
+        for radius in (0, 2):
+            lo, hi = max(mark.line - radius, 0), mark.line + radius + 1
+            window = "\n".join(lines[lo:hi])
+            fixed = _quote_descriptions(window)
+            if fixed == window:
+                continue
+            candidate = "\n".join([*lines[:lo], fixed, *lines[hi:]])
+            try:
+                return candidate, load_yaml(candidate)
+            except yaml.YAMLError:
+                pass
+
+    fixed = _quote_descriptions(cleaned)
+    return fixed, load_yaml(fixed)
+
+
 def sanitize_yaml(text: str) -> str:
     """
     Strip ``` fences and quote colons inside description strings.
     If YAML still fails to parse, try quoting suspicious descriptions.
     """
-    cleaned = dedent(_FENCE.sub("", text)).strip()
+    cleaned = _strip_fences(text)
     try:
-        yaml.safe_load(cleaned)
+        load_yaml(cleaned)
         return cleaned
-    except yaml.YAMLError:
-        pass
+    except yaml.YAMLError as err:
+        try:
+            return _repair(cleaned, err)[0]
+        except yaml.YAMLError:
+            return _quote_descriptions(cleaned)
+
+
+def parse_llm_yaml(text: str) -> Any:
+    """
+    Single-pass counterpart of `sanitize_yaml`: return the *parsed* reply.
+    The description-quoting fix and re-parse only run if the first parse
+    fails; a final failure raises ``yaml.YAMLError``.
+    """
+    cleaned = _strip_fences(text)
+    try:
+        return load_yaml(cleaned)
+    except yaml.YAMLError as err:
+        return _repair(cleaned, err)[1]
 
-    fixed = "\n".join(
-        f'{m.group(1)}"{_squash_description(m.group(2))}"'
-        if (m := _NEED_QUOTE.match(line))
-        else line
-        for line in cleaned.splitlines()
-    )
-    return fixed
 
+class _Pretty(_Dumper):
+    pass
 
-def dump_yaml(obj: dict[str, Any], path_or_handle: Path | Any) -> None:
-    """Pretty-dump YAML with block scalars and indented lists."""
-    class _Pretty(yaml.SafeDumper):
-        pass
 
-    _Pretty.add_representer(OrderedDict, yaml.SafeDumper.represent_dict)
+# canonise_model returns plain dicts now; kept for callers still passing OrderedDict
+_Pretty.add_representer(OrderedDict, _Dumper.represent_dict)
 
+def dump_yaml(obj: dict[str, Any], path_or_handle: Path | Any) -> None:
+    """Pretty-dump YAML with block scalars and indented lists."""
     if isinstance(path_or_handle, (str, Path)):
         with Path(path_or_handle).open("w", encoding="utf-8") as fh:
             yaml.dump(